@@ -1,13 +1,101 @@
 import streamlit as st
+from io import BytesIO
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import seaborn as sns
-import matplotlib.pyplot as plt
 
 # Page setup
 st.set_page_config(page_title="Advanced Data Analytics", layout="wide")
 
+# Heatmaps wider than this are drawn without per-cell value labels (values stay on hover)
+MAX_ANNOTATED_COLS = 20
+
+# pandas' default missing-value markers, so the pyarrow and pandas CSV paths agree on what is NaN
+CSV_NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+
+# Cached helpers (reused across reruns instead of recomputing on every widget change)
+@st.cache_data
+def load_csv(file_bytes):
+    # pyarrow parses multi-threaded in C++; pandas is the fallback and the reference behaviour
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+    except ImportError:
+        return pd.read_csv(BytesIO(file_bytes))
+
+    def read_arrow(column_types=None):
+        return pacsv.read_csv(
+            BytesIO(file_bytes),
+            read_options=pacsv.ReadOptions(use_threads=True),
+            convert_options=pacsv.ConvertOptions(
+                column_types=column_types,
+                null_values=CSV_NA_VALUES,
+                strings_can_be_null=True,
+                true_values=["True", "TRUE", "true"],
+                false_values=["False", "FALSE", "false"],
+            ),
+        )
+
+    try:
+        table = read_arrow()
+        # pandas renames repeated headers (a, a.1, ...) and blank ones (Unnamed: 0); let it handle those files
+        names = table.column_names
+        if len(set(names)) != len(names) or "" in names:
+            return pd.read_csv(BytesIO(file_bytes))
+        # Timestamp/time text does not survive a cast back to string unchanged, so only those
+        # columns force a second parse, reading them as plain strings
+        reparse_types = {
+            f.name: pa.string() for f in table.schema if pa.types.is_timestamp(f.type) or pa.types.is_time(f.type)
+        }
+        if reparse_types:
+            table = read_arrow(reparse_types)
+    except pa.ArrowInvalid:
+        return pd.read_csv(BytesIO(file_bytes))
+    # ISO dates cast back to identical text, and all-empty columns become float NaN as in pandas.
+    # Known difference: integers beyond int64 come out as float64 here, where pandas keeps them as text
+    schema = pa.schema([
+        f.with_type(pa.string()) if pa.types.is_date(f.type)
+        else f.with_type(pa.float64()) if pa.types.is_null(f.type)
+        else f
+        for f in table.schema
+    ])
+    return table.cast(schema).to_pandas(self_destruct=True)
+
+@st.cache_data
+def to_numeric_frame(df):
+    # Only non-numeric columns need coercion; numeric ones pass through untouched
+    obj_cols = df.select_dtypes(exclude=np.number).columns
+    if not obj_cols.empty:
+        converted = df[obj_cols].apply(pd.to_numeric, errors='coerce')
+        df = pd.concat([df.drop(columns=obj_cols), converted], axis=1)[df.columns]
+    # Narrow int64 columns to the smallest integer dtype that holds them; this is exact,
+    # unlike a float32 downcast, so describe() and the CSV export keep every digit
+    int_cols = df.select_dtypes(include='int64').columns
+    if not int_cols.empty:
+        df = df.assign(**df[int_cols].apply(pd.to_numeric, downcast='integer'))
+    return df
+
+@st.cache_data
+def describe_frame(df, include=None):
+    return df.describe(include=include)
+
+@st.cache_data
+def correlation_matrix(df_numeric):
+    # np.corrcoef runs on BLAS but has no NaN handling; pandas' pairwise-complete corr covers that case
+    arr = df_numeric.to_numpy(dtype=np.float64, na_value=np.nan)
+    if not np.isfinite(arr).all():
+        return df_numeric.corr()
+    cc = np.corrcoef(arr, rowvar=False)
+    return pd.DataFrame(cc, index=df_numeric.columns, columns=df_numeric.columns)
+
+@st.cache_data
+def to_csv_bytes(df):
+    buf = BytesIO()
+    df.to_csv(buf, index=False)
+    return buf.getvalue()
+
 # Show centered logo
 col1, col2, col3 = st.columns([1, 2, 1])
 with col2:
@@ -19,7 +107,7 @@ uploaded_file = st.file_uploader("Upload your CSV file", type=["csv"])
 
 if uploaded_file is not None:
     # Load data
-    df = pd.read_csv(uploaded_file)
+    df = load_csv(uploaded_file.getvalue())
     st.success("File uploaded successfully")
 
     # Show raw data preview
@@ -27,35 +115,44 @@ if uploaded_file is not None:
     st.dataframe(df.head())
 
     # Show data types and sample values (convert samples to strings to avoid errors)
+    # Samples are drawn from the first 200 rows only, so large files are not scanned in full
     st.subheader("Data Types and Sample Values")
     col_types = pd.DataFrame({
         "Column": df.columns,
         "Data Type": df.dtypes,
-        "Sample Values": [str(df[col].dropna().unique()[:5]) for col in df.columns]
+        "Sample Values": [str(df[col].head(200).dropna().unique()[:5].tolist()) for col in df.columns]
     })
     st.dataframe(col_types)
 
     # Convert columns to numeric where possible (non-convertible become NaN)
-    df_numeric = df.copy()
-    for col in df.columns:
-        df_numeric[col] = pd.to_numeric(df[col], errors='coerce')
+    df_numeric = to_numeric_frame(df)
 
     # Summary statistics on original df (including categoricals)
     st.subheader("Summary Statistics (Original Data)")
-    st.write(df.describe(include='all'))
+    st.write(describe_frame(df, include='all'))
 
     # Summary statistics on cleaned numeric data
     st.subheader("Summary Statistics (Numeric Columns Only)")
-    st.write(df_numeric.describe())
+    st.write(describe_frame(df_numeric))
 
     # Correlation heatmap on numeric columns only
     numeric_cols = df_numeric.select_dtypes(include=np.number).columns
+    if len(numeric_cols) >= 2:
+        import plotly.express as px  # only needed by the heatmap and scatter plot below
+
     st.subheader("Correlation Heatmap")
     if len(numeric_cols) >= 2:
-        corr = df_numeric[numeric_cols].corr()
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.heatmap(corr, annot=True, cmap="coolwarm", ax=ax)
-        st.pyplot(fig)
+        corr = correlation_matrix(df_numeric[numeric_cols])
+        # Per-cell annotations only for narrow frames; wide frames render as a single image trace
+        fig = px.imshow(
+            corr,
+            color_continuous_scale="RdBu_r",
+            zmin=-1,
+            zmax=1,
+            text_auto=".2f" if len(numeric_cols) <= MAX_ANNOTATED_COLS else False,
+            aspect="auto",
+        )
+        st.plotly_chart(fig, use_container_width=True)
     else:
         st.info("Not enough numeric columns for correlation heatmap.")
 
@@ -71,10 +168,9 @@ if uploaded_file is not None:
 
     # Download cleaned numeric data
     st.subheader("Download Cleaned Numeric Data")
-    csv = df_numeric.to_csv(index=False)
     st.download_button(
         label="Download CSV",
-        data=csv,
+        data=to_csv_bytes(df_numeric),
         file_name="cleaned_numeric_data.csv",
         mime="text/csv",
     )
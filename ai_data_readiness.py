@@ -1,14 +1,10 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
-from PIL import Image
-from colorthief import ColorThief
+import functools
 import os
+import types
 from io import BytesIO
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-from reportlab.lib.utils import ImageReader
 
 # --- Page Config ---
 st.set_page_config(
@@ -17,38 +13,8 @@ st.set_page_config(
     layout="wide"
 )
 
-# --- Initialize colors ---
-primary_color = "#1f4e79"   # fallback
-secondary_color = "#ffcc00" # fallback
-primary_color_light = primary_color  # default
-
-logo_path = "emanations_logo.png"
-
-def lighten_color(hex_color, factor=0.3):
-    """Lighten a hex color by a factor (0-1)"""
-    hex_color = hex_color.lstrip('#')
-    r = int(hex_color[0:2],16)
-    g = int(hex_color[2:4],16)
-    b = int(hex_color[4:6],16)
-    r = int(r + (255-r)*factor)
-    g = int(g + (255-g)*factor)
-    b = int(b + (255-b)*factor)
-    return f'#{r:02x}{g:02x}{b:02x}'
-
-if os.path.exists(logo_path):
-    try:
-        color_thief = ColorThief(logo_path)
-        palette = color_thief.get_palette(color_count=2)
-        primary_color = '#%02x%02x%02x' % palette[0]
-        secondary_color = '#%02x%02x%02x' % palette[1] if len(palette) > 1 else "#ffcc00"
-        primary_color_light = lighten_color(primary_color, 0.3)
-    except Exception:
-        st.warning("Could not extract colors from logo, using defaults.")
-else:
-    st.warning(f"Logo not found at {logo_path}. Using default colors.")
-
-# --- Custom CSS ---
-st.markdown(f"""
+# --- CSS template (filled in once the palette is known) ---
+CSS_TEMPLATE = """
 <style>
 .stApp {{
     background-color: #f9f9fb;
@@ -80,12 +46,58 @@ st.markdown(f"""
     color: #444 !important;
 }}
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# --- Initialize colors ---
+primary_color = "#1f4e79"   # fallback
+secondary_color = "#ffcc00" # fallback
+primary_color_light = primary_color  # default
+
+logo_path = "emanations_logo.png"
+
+@functools.lru_cache(maxsize=32)
+def lighten_color(hex_color, factor=0.3):
+    """Lighten a hex color by a factor (0-1)"""
+    rgb = np.frombuffer(bytes.fromhex(hex_color.lstrip('#')), dtype=np.uint8).astype(np.float32)
+    rgb = rgb + (255-rgb)*factor
+    return '#' + rgb.astype(np.uint8).tobytes().hex()
+
+# Logo decoding and palette extraction run once per process; mtime invalidates on file change
+@st.cache_resource
+def get_logo_palette(path, mtime):
+    from colorthief import ColorThief
+    return ColorThief(path).get_palette(color_count=2)
+
+@st.cache_resource
+def load_logo(path, mtime):
+    from PIL import Image
+    logo = Image.open(path)
+    logo.load()
+    return logo
+
+if os.path.exists(logo_path):
+    try:
+        palette = get_logo_palette(logo_path, os.path.getmtime(logo_path))
+        primary_color = '#%02x%02x%02x' % palette[0]
+        secondary_color = '#%02x%02x%02x' % palette[1] if len(palette) > 1 else "#ffcc00"
+        primary_color_light = lighten_color(primary_color, 0.3)
+    except Exception:
+        st.warning("Could not extract colors from logo, using defaults.")
+else:
+    st.warning(f"Logo not found at {logo_path}. Using default colors.")
+
+# --- Custom CSS ---
+CSS = CSS_TEMPLATE.format(
+    primary_color=primary_color,
+    secondary_color=secondary_color,
+    primary_color_light=primary_color_light,
+)
+st.markdown(CSS, unsafe_allow_html=True)
 
 # --- Logo ---
 if os.path.exists(logo_path):
     try:
-        logo = Image.open(logo_path)
+        logo = load_logo(logo_path, os.path.getmtime(logo_path))
         st.image(logo, width=1000)
     except:
         st.warning("Could not open logo image. Skipping display.")
@@ -94,7 +106,7 @@ st.title("Emanations AI Data Readiness Assessment – Sandbox Tool")
 st.write("Score each question from 0 (Not ready) to 10 (Fully ready). Add comments where needed.")
 
 # --- Sections & Questions ---
-sections = {
+SECTIONS = types.MappingProxyType({
     "Data Availability": [
         "Relevant datasets exist for project goals",
         "Datasets are accessible internally or externally",
@@ -134,41 +146,61 @@ sections = {
         "Collaboration avoids privacy/IP issues",
         "Incentives/agreements in place for contributions"
     ]
-}
-
-total_score = 0
-max_score = 0
-section_scores = {}
-results = {}
-
-# --- Input Loop ---
-for section, questions in sections.items():
-    st.header(section)
-    results[section] = {}
-    section_total = 0
-    section_max = 0
-
-    for q in questions:
-        col1, col2 = st.columns([1,3])
-        with col1:
-            score = st.slider(q, min_value=0, max_value=10, value=0, key=f"{section}-{q}-score")
-        with col2:
-            comment = st.text_input("Comment", key=f"{section}-{q}-comment")
-
-        results[section][q] = {"score": score, "comment": comment}
-        total_score += score
-        max_score += 10
-        section_total += score
-        section_max += 10
-
-    section_percentage = (section_total / section_max) * 100
+})
+
+# Flattened (section, question) list and section boundaries into it
+questions_flat = [(section, q) for section, questions in SECTIONS.items() for q in questions]
+section_sizes = np.array([len(questions) for questions in SECTIONS.values()])
+section_offsets = np.concatenate(([0], np.cumsum(section_sizes)))
+
+n_questions = len(questions_flat)
+scores = np.zeros(n_questions, dtype=np.int8)
+comments = [""] * n_questions
+section_status = {}
+
+# --- Input Form ---
+# Slider and comment changes are batched; the script only reruns when the form is submitted
+with st.form("assessment", clear_on_submit=False):
+    for section, start, end in zip(SECTIONS, section_offsets[:-1], section_offsets[1:]):
+        st.header(section)
+
+        for i in range(start, end):
+            q = questions_flat[i][1]
+            col1, col2 = st.columns([1,3])
+            # Widget keys are flat positions: scores use i, comments use n_questions + i
+            with col1:
+                scores[i] = st.slider(q, min_value=0, max_value=10, value=0, key=i)
+            with col2:
+                comments[i] = st.text_input("Comment", key=n_questions + i)
+
+        # Filled in below once all section totals are known
+        section_status[section] = st.empty()
+
+    submitted = st.form_submit_button("Compute Readiness")
+
+# Once the form has been submitted, keep showing results for the rest of the session (e.g. across PDF button reruns)
+if submitted:
+    st.session_state["assessment_scored"] = True
+if not st.session_state.get("assessment_scored", False):
+    st.info("Score the questions above and click 'Compute Readiness' to see the results.")
+    st.stop()
+
+# --- Section Scores ---
+section_totals = np.add.reduceat(scores, section_offsets[:-1], dtype=np.int64)
+section_percentages = section_totals / (section_sizes * 10) * 100
+section_scores = dict(zip(SECTIONS, section_percentages.tolist()))
+
+for section, section_percentage in section_scores.items():
+    status = section_status[section]
     if section_percentage >= 75:
-        st.success(f"{section} Readiness: {section_percentage:.0f}%")
+        status.success(f"{section} Readiness: {section_percentage:.0f}%")
     elif section_percentage >= 50:
-        st.warning(f"{section} Readiness: {section_percentage:.0f}%")
+        status.warning(f"{section} Readiness: {section_percentage:.0f}%")
     else:
-        st.error(f"{section} Readiness: {section_percentage:.0f}%")
-    section_scores[section] = section_percentage
+        status.error(f"{section} Readiness: {section_percentage:.0f}%")
+
+total_score = int(scores.sum())
+max_score = n_questions * 10
 
 # --- Overall Score ---
 st.header("Overall Assessment")
@@ -181,49 +213,72 @@ else:
     st.error(f"Low readiness – {overall_percentage:.0f}%")
 
 # --- Radar Chart ---
-st.subheader("Readiness by Section (Radar Chart)")
-radar_buf = None
-if section_scores:
-    labels = list(section_scores.keys())
-    values = list(section_scores.values())
-    values += values[:1]
+# Both builders are cached on the section scores, so unrelated reruns (e.g. comment edits) reuse them
+@st.cache_data
+def build_radar(labels, values, color):
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Scatterpolar(
+        r=list(values) + list(values[:1]),
+        theta=list(labels) + list(labels[:1]),
+        fill="toself",
+        name="Readiness",
+        line=dict(color=color, width=2),
+    ))
+    fig.update_layout(
+        title=dict(text="<b>Section-wise Readiness</b>", font=dict(size=14, color=color)),
+        polar=dict(radialaxis=dict(range=[0, 100], tickvals=[25, 50, 75, 100])),
+        showlegend=True,
+    )
+    return fig
+
+@st.cache_data
+def render_radar_png(labels, values, color):
+    # Static PNG for the PDF; only rendered when a PDF report is requested
+    import matplotlib.pyplot as plt
+
+    values = list(values) + list(values[:1])
     angles = np.linspace(0, 2*np.pi, len(labels), endpoint=False).tolist()
     angles += angles[:1]
 
     fig, ax = plt.subplots(figsize=(6,6), subplot_kw=dict(polar=True))
-    ax.plot(angles, values, "o-", linewidth=2, label="Readiness", color=primary_color_light)
-    ax.fill(angles, values, alpha=0.25, color=primary_color_light)
+    ax.plot(angles, values, "o-", linewidth=2, label="Readiness", color=color)
+    ax.fill(angles, values, alpha=0.25, color=color)
     ax.set_yticks([25, 50, 75, 100])
     ax.set_xticks(angles[:-1])
     ax.set_xticklabels(labels, fontsize=10, color="#333333")
     ax.set_ylim(0, 100)
-    ax.set_title("Section-wise Readiness", size=14, weight="bold", color=primary_color_light)
+    ax.set_title("Section-wise Readiness", size=14, weight="bold", color=color)
     ax.legend(loc="upper right", bbox_to_anchor=(0.1, 0.1))
-    st.pyplot(fig)
 
-    # Save radar chart to buffer for PDF
-    radar_buf = BytesIO()
-    plt.savefig(radar_buf, format="PNG")
-    radar_buf.seek(0)
+    buf = BytesIO()
+    fig.savefig(buf, format="PNG")
     plt.close(fig)
+    return buf.getvalue()
+
+st.subheader("Readiness by Section (Radar Chart)")
+radar_labels = tuple(section_scores.keys())
+radar_values = tuple(section_scores.values())
+if section_scores:
+    st.plotly_chart(build_radar(radar_labels, radar_values, primary_color_light), use_container_width=True)
 
 # --- CSV Download ---
 if st.button("Download Results as CSV"):
-    data_rows = []
-    for section, qs in results.items():
-        for q, vals in qs.items():
-            data_rows.append({
-                "Section": section,
-                "Question": q,
-                "Score": vals["score"],
-                "Comment": vals["comment"]
-            })
-    df = pd.DataFrame(data_rows)
+    df = pd.DataFrame({
+        "Section": [section for section, _ in questions_flat],
+        "Question": [q for _, q in questions_flat],
+        "Score": scores,
+        "Comment": comments,
+    })
     df.to_csv("AI_Data_Readiness_Assessment.csv", index=False)
     st.success("CSV downloaded successfully!")
 
 # --- PDF Download ---
-def create_pdf(results, section_scores, overall_percentage, radar_buf, logo_path="emanations_logo.png"):
+def create_pdf(section_scores, overall_percentage, radar_buf, logo_path="emanations_logo.png"):
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.utils import ImageReader
+
     buffer = BytesIO()
     c = canvas.Canvas(buffer, pagesize=letter)
     width, height = letter
@@ -246,11 +301,12 @@ def create_pdf(results, section_scores, overall_percentage, radar_buf, logo_path
     c.setFillColorRGB(0, 0, 0)
     c.drawString(50, height - 120, f"Overall Readiness: {overall_percentage:.0f}%")
 
-    # Section scores
-    y = height - 160
+    # Section scores (one text object instead of a drawString per line)
+    section_text = c.beginText(50, height - 160)
+    section_text.setFont("Helvetica", 12, leading=20)
     for section, perc in section_scores.items():
-        c.drawString(50, y, f"{section}: {perc:.0f}%")
-        y -= 20
+        section_text.textLine(f"{section}: {perc:.0f}%")
+    c.drawText(section_text)
 
     # Radar chart
     if radar_buf:
@@ -267,11 +323,13 @@ def create_pdf(results, section_scores, overall_percentage, radar_buf, logo_path
     buffer.seek(0)
     return buffer
 
-pdf_buffer = create_pdf(results, section_scores, overall_percentage, radar_buf)
+if st.button("Generate PDF Report"):
+    radar_buf = BytesIO(render_radar_png(radar_labels, radar_values, primary_color_light)) if section_scores else None
+    pdf_buffer = create_pdf(section_scores, overall_percentage, radar_buf)
 
-st.download_button(
-    label="📄 Download results as PDF",
-    data=pdf_buffer,
-    file_name="AI_Data_Readiness_Report.pdf",
-    mime="application/pdf",
-)
+    st.download_button(
+        label="📄 Download results as PDF",
+        data=pdf_buffer,
+        file_name="AI_Data_Readiness_Report.pdf",
+        mime="application/pdf",
+    )
@@ -1,3 +1,6 @@
+import importlib.util
+import json
+import os
 import pandas as pd
 import numpy as np
 import tkinter as tk
@@ -8,15 +11,43 @@ from tkinter import filedialog, messagebox, ttk
 # ----------------------------
 df = None
 report = {}
+_iqr_mask_numba = None  # compiled on first use of the numba engine
+
+# Columnar formats first; Excel (openpyxl) is only used when explicitly chosen
+file_types = [("Parquet files", "*.parquet"), ("Feather files", "*.feather"), ("Excel files", "*.xlsx *.xls")]
 
 # ----------------------------
 # Functions
 # ----------------------------
+def read_data(file_path):
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext == ".parquet":
+        return pd.read_parquet(file_path)
+    if ext == ".feather":
+        return pd.read_feather(file_path)
+    return pd.read_excel(file_path)
+
+def write_data(data, file_path):
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext in (".xlsx", ".xls"):
+        data.to_excel(file_path, index=False)
+        return
+    # pyarrow is imported here, not at startup; ImportError propagates if it is missing
+    from pyarrow import ArrowInvalid, ArrowTypeError
+    try:
+        if ext == ".feather":
+            data.to_feather(file_path)
+        else:
+            data.to_parquet(file_path, index=False)
+    except (ArrowInvalid, ArrowTypeError) as e:
+        # e.g. object columns mixing numbers and text, which Parquet/Feather cannot store
+        raise ValueError(str(e)) from e
+
 def load_file():
     global df, report
-    file_path = filedialog.askopenfilename(filetypes=[("Excel files", "*.xlsx *.xls")])
+    file_path = filedialog.askopenfilename(filetypes=file_types)
     if file_path:
-        df = pd.read_excel(file_path)
+        df = read_data(file_path)
         report = {'initial_rows': df.shape[0], 'initial_columns': df.shape[1], 'actions': {}}
         messagebox.showinfo("Loaded", f"File loaded successfully: {file_path}\nRows: {df.shape[0]}, Columns: {df.shape[1]}")
         update_buttons(state="normal")
@@ -81,33 +112,77 @@ def preview_missing():
 # Preview and Remove Duplicates
 # ----------------------------
 def preview_duplicates():
-    duplicates_count = df.duplicated().sum()
+    global df
+    duplicate_mask = df.duplicated()
+    duplicates_count = int(duplicate_mask.sum())
     if duplicates_count == 0:
         messagebox.showinfo("Duplicates", "No duplicate rows found.")
         return
     if messagebox.askyesno("Duplicates", f"{duplicates_count} duplicate rows found.\nDo you want to remove them?"):
-        df.drop_duplicates(inplace=True)
+        df = df.loc[~duplicate_mask].reset_index(drop=True)
         report['actions']['duplicates_removed'] = duplicates_count
         messagebox.showinfo("Duplicates", f"{duplicates_count} duplicate rows removed.")
 
 # ----------------------------
 # Preview and Remove Outliers
 # ----------------------------
+def get_iqr_mask_numba():
+    # numba is optional and only imported (and the kernel compiled) when the numba engine is chosen
+    global _iqr_mask_numba
+    if _iqr_mask_numba is None:
+        from numba import njit, prange
+
+        @njit(parallel=True)
+        def kernel(arr, out):
+            # One column per thread; both quartiles come from a single nanpercentile call
+            quartiles = np.array([25.0, 75.0])
+            for j in prange(arr.shape[1]):
+                col = arr[:, j]
+                Q1, Q3 = np.nanpercentile(col, quartiles)
+                IQR = Q3 - Q1
+                lower = Q1 - 1.5*IQR
+                upper = Q3 + 1.5*IQR
+                for i in range(arr.shape[0]):
+                    out[i, j] = col[i] < lower or col[i] > upper
+
+        _iqr_mask_numba = kernel
+    return _iqr_mask_numba
+
+def iqr_outlier_mask(frame, numeric_cols, engine="numpy"):
+    # engine="numba" opts in to the parallel kernel (requires numba)
+    if engine == "numba":
+        kernel = get_iqr_mask_numba()
+        # Fortran order keeps each column contiguous for the per-column kernel
+        arr = np.asfortranarray(frame[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan))
+        outlier_mask = np.zeros(arr.shape, dtype=np.bool_)
+        kernel(arr, outlier_mask)
+        return outlier_mask, outlier_mask.any(axis=1)
+
+    # Single pass over the whole numeric block instead of per-column quantiles
+    arr = frame[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+    Q1, Q3 = np.nanpercentile(arr, [25, 75], axis=0)
+    IQR = Q3 - Q1
+    outlier_mask = (arr < Q1 - 1.5*IQR) | (arr > Q3 + 1.5*IQR)
+    return outlier_mask, outlier_mask.any(axis=1)
+
+def outlier_engine():
+    return "numba" if use_numba.get() else "numpy"
+
 def preview_outliers():
     numeric_cols = df.select_dtypes(include=[np.number]).columns
-    outlier_rows = pd.DataFrame()
-    for col in numeric_cols:
-        Q1 = df[col].quantile(0.25)
-        Q3 = df[col].quantile(0.75)
-        IQR = Q3 - Q1
-        col_outliers = df[(df[col] < Q1 - 1.5*IQR) | (df[col] > Q3 + 1.5*IQR)]
-        if not col_outliers.empty:
-            col_outliers["OutlierColumn"] = col
-            outlier_rows = pd.concat([outlier_rows, col_outliers])
-
-    if outlier_rows.empty:
+    if numeric_cols.empty:
         messagebox.showinfo("Outliers", "No outliers detected.")
         return
+    outlier_mask, row_is_outlier = iqr_outlier_mask(df, numeric_cols, engine=outlier_engine())
+
+    if not row_is_outlier.any():
+        messagebox.showinfo("Outliers", "No outliers detected.")
+        return
+
+    outlier_rows = df.loc[row_is_outlier].head(50)  # Show first 50 rows
+    outlier_rows = outlier_rows.assign(
+        OutlierColumns=[", ".join(map(str, numeric_cols[m])) for m in outlier_mask[row_is_outlier][:50]]
+    )
 
     preview_window = tk.Toplevel(root)
     preview_window.title("Outliers Preview")
@@ -115,21 +190,16 @@ def preview_outliers():
     tk.Label(preview_window, text="Preview of outlier rows:").pack()
     text = tk.Text(preview_window, wrap="none", height=20)
     text.pack(fill="both", expand=True)
-    text.insert(tk.END, outlier_rows.head(50).to_string())  # Show first 50 rows
+    text.insert(tk.END, outlier_rows.to_string())
 
     def apply_outliers():
-        for col in numeric_cols:
-            Q1 = df[col].quantile(0.25)
-            Q3 = df[col].quantile(0.75)
-            IQR = Q3 - Q1
-            before_rows = df.shape[0]
-            df_filtered = df[(df[col] >= Q1 - 1.5*IQR) & (df[col] <= Q3 + 1.5*IQR)]
-            removed = before_rows - df_filtered.shape[0]
-            df.drop(df.index, inplace=True)
-            df_filtered.index = df.index
-            df.update(df_filtered)
-            if removed > 0:
-                report['actions'][f'outliers_removed_{col}'] = removed
+        global df
+        # The preview window is non-modal, so df may have changed since it opened; recompute the mask
+        current_cols = df.select_dtypes(include=[np.number]).columns
+        if not current_cols.empty:
+            _, current_outliers = iqr_outlier_mask(df, current_cols, engine=outlier_engine())
+            df = df.loc[~current_outliers].reset_index(drop=True)
+            report['actions']['outliers_removed'] = int(current_outliers.sum())
         preview_window.destroy()
         messagebox.showinfo("Outliers", "Outliers removed as per IQR method.")
 
@@ -139,22 +209,27 @@ def preview_outliers():
 # Save Cleaned Data and Report
 # ----------------------------
 def save_cleaned():
-    cleaned_file = filedialog.asksaveasfilename(defaultextension=".xlsx", filetypes=[("Excel files", "*.xlsx *.xls")])
+    cleaned_file = filedialog.asksaveasfilename(defaultextension=".parquet", filetypes=file_types)
     if cleaned_file:
-        df.to_excel(cleaned_file, index=False)
+        try:
+            write_data(df, cleaned_file)
+        except (ImportError, ValueError) as e:
+            messagebox.showerror("Save Failed", f"Could not save {cleaned_file}:\n{e}\n\nTry saving as an Excel file (.xlsx) instead.")
+            return
         report['final_rows'] = df.shape[0]
         report['final_columns'] = df.shape[1]
-        report_file = cleaned_file.replace(".xlsx", "_report.xlsx")
-        pd.DataFrame.from_dict(report, orient='index').to_excel(report_file)
+        report_file = os.path.splitext(cleaned_file)[0] + "_report.json"
+        with open(report_file, "w") as f:
+            json.dump(report, f, indent=2, default=str)
         messagebox.showinfo("Saved", f"Cleaned data saved to {cleaned_file}\nReport saved to {report_file}")
 
 # ----------------------------
 # GUI Setup
 # ----------------------------
 root = tk.Tk()
-root.title("Advanced Excel Data Cleaner")
+root.title("Advanced Data Cleaner")
 
-btn_load = tk.Button(root, text="Load Excel File", command=load_file, width=40)
+btn_load = tk.Button(root, text="Load Data File", command=load_file, width=40)
 btn_load.pack(pady=10)
 
 btn_missing = tk.Button(root, text="Preview & Fill Missing Values", command=preview_missing, state="disabled", width=40)
@@ -166,6 +241,12 @@ btn_duplicates.pack(pady=5)
 btn_outliers = tk.Button(root, text="Preview & Remove Outliers", command=preview_outliers, state="disabled", width=40)
 btn_outliers.pack(pady=5)
 
+# Opt-in numba engine for outlier detection on very large files (disabled when numba is not installed)
+use_numba = tk.BooleanVar(value=False)
+chk_numba = tk.Checkbutton(root, text="Use numba for outlier detection (large files)", variable=use_numba,
+                           state="normal" if importlib.util.find_spec("numba") else "disabled")
+chk_numba.pack(pady=5)
+
 btn_save = tk.Button(root, text="Save Cleaned Data & Report", command=save_cleaned, state="disabled", width=40)
 btn_save.pack(pady=10)
 